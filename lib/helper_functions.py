@@ -1,13 +1,156 @@
+import json
 import logging
+from atexit import register
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from importlib import reload
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 from string import ascii_uppercase
+from threading import Event, Lock, Thread
 
 from bs4 import BeautifulSoup
 from requests import get
 
 stock_list = []
+loggers = ()
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each log record as a single line of JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Converts the log record into a JSON string.
+
+        Args:
+            record: Log record that has to be formatted.
+
+        Returns:
+            str:
+            JSON string with the time, level, logger, thread, function, line and the message.
+        """
+        entry = {
+            'time': self.formatTime(record, self.datefmt),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'function': record.funcName,
+            'line': record.lineno,
+            'message': record.getMessage()
+        }
+        if ticker := getattr(record, 'ticker', None):
+            entry['ticker'] = ticker
+        if sampled := getattr(record, 'sampled', None):
+            entry['sampled'] = sampled
+        return json.dumps(entry)
+
+
+class BatchFileHandler(logging.FileHandler):
+    """Buffers the formatted records and writes them to the file in batches.
+
+    See Also:
+        The buffer is flushed when it reaches ``capacity`` records, and every ``interval`` seconds by a timer thread,
+        so that records are written even when nothing else is logged. Pending records are written on close.
+    """
+
+    def __init__(self, filename: str, capacity: int = 500, interval: float = 1.0):
+        super().__init__(filename=filename)
+        self.capacity = capacity
+        self.interval = interval
+        self.buffer = []
+        self.stopped = Event()
+        self.timer = Thread(target=self._flush_periodically, name='log_flusher', daemon=True)
+        self.timer.start()
+
+    def _flush_periodically(self) -> None:
+        """Flushes the buffer every ``interval`` seconds until the handler is closed."""
+        while not self.stopped.wait(self.interval):
+            self.flush()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Appends the formatted record to the buffer.
+
+        Args:
+            record: Log record that has to be written.
+        """
+        try:
+            self.buffer.append(self.format(record))
+        except Exception:
+            self.handleError(record)
+        if len(self.buffer) >= self.capacity:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes all the buffered records to the file."""
+        with self.lock:
+            if self.buffer and self.stream:
+                self.stream.write('\n'.join(self.buffer) + '\n')
+                self.buffer.clear()
+            super().flush()
+
+    def close(self) -> None:
+        """Stops the timer and writes the pending records before closing the file."""
+        self.stopped.set()
+        self.flush()
+        super().close()
+
+
+class SamplingFilter(logging.Filter):
+    """Samples repetitive errors of a ticker, so that a failing ticker does not flood the logs.
+
+    See Also:
+        - Records without a ``ticker`` attribute are always logged.
+        - The first ``burst`` records from the same ticker and line are logged, followed by one in every ``every``.
+    """
+
+    def __init__(self, burst: int = 3, every: int = 50):
+        super().__init__()
+        self.burst = burst
+        self.every = every
+        self.counter = Counter()
+        self.lock = Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Decides whether the record has to be logged.
+
+        Args:
+            record: Log record that has to be filtered.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the record should be logged.
+        """
+        if not (ticker := getattr(record, 'ticker', None)):
+            return True
+        with self.lock:
+            self.counter[ticker, record.levelno, record.lineno] += 1
+            count = self.counter[ticker, record.levelno, record.lineno]
+        if count <= self.burst:
+            return True
+        if (count - self.burst) % self.every == 0:
+            record.sampled = count
+            return True
+        return False
+
+
+class NameFilter(logging.Filter):
+    """Allows records only from the loggers that are meant to reach a handler."""
+
+    def __init__(self, *names: str):
+        super().__init__()
+        self.names = names
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Checks if the record was logged by one of the allowed loggers.
+
+        Args:
+            record: Log record that has to be filtered.
+
+        Returns:
+            bool:
+            A boolean flag to indicate whether the record should be handled.
+        """
+        return record.name in self.names
 
 
 def logging_wrapper() -> tuple:
@@ -17,13 +160,17 @@ def logging_wrapper() -> tuple:
         - fileLogger: Writes the log information only to the log file.
         - consoleLogger: Writes the log information only in stdout.
         - rootLogger: Logs the entry in both stdout and log file.
+        - Loggers only put the records in a queue, a listener thread writes them to stdout and a JSON lines file.
+        - Configured only once, subsequent calls return the same loggers.
 
     Returns:
         tuple:
         A tuple of classes logging.Logger for file, console and root logging.
     """
-    log_file = datetime.now().strftime('logs/stock_logs_%H:%M_%d-%m-%Y.log')
-    reload(logging)  # since the gmail-connector module uses logging, it is better to reload logging module before start
+    global loggers
+    if loggers:
+        return loggers
+    log_file = datetime.now().strftime('logs/stock_logs_%H:%M_%d-%m-%Y.jsonl')
     log_formatter = logging.Formatter(
         fmt="%(asctime)s - [%(levelname)s] - %(name)s - %(funcName)s - Line: %(lineno)d - %(message)s",
         datefmt='%b-%d-%Y %H:%M:%S'
@@ -33,20 +180,27 @@ def logging_wrapper() -> tuple:
     console_logger = logging.getLogger('CONSOLE')
     root_logger = logging.getLogger("thor")
 
-    file_handler = logging.FileHandler(filename=log_file)
-    file_handler.setFormatter(fmt=log_formatter)
-    file_logger.setLevel(level=logging.DEBUG)
-    file_logger.addHandler(hdlr=file_handler)
+    file_handler = BatchFileHandler(filename=log_file)
+    file_handler.setFormatter(fmt=JsonFormatter(datefmt='%b-%d-%Y %H:%M:%S'))
+    file_handler.addFilter(filter=NameFilter('FILE', 'thor'))
 
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(fmt=log_formatter)
-    console_logger.setLevel(level=logging.DEBUG)
-    console_logger.addHandler(hdlr=console_handler)
-
-    root_logger.addHandler(hdlr=file_handler)
-    root_logger.addHandler(hdlr=console_handler)
-    root_logger.setLevel(level=logging.DEBUG)
-    return file_logger, console_logger, root_logger
+    console_handler.addFilter(filter=NameFilter('CONSOLE', 'thor'))
+
+    log_queue = SimpleQueue()
+    queue_handler = QueueHandler(queue=log_queue)
+    queue_handler.addFilter(filter=SamplingFilter())
+    listener = QueueListener(log_queue, file_handler, console_handler)
+    listener.start()
+    register(listener.stop)  # drains the queue, before the handlers are closed by logging.shutdown
+
+    for logger in (file_logger, console_logger, root_logger):
+        logger.setLevel(level=logging.DEBUG)
+        logger.addHandler(hdlr=queue_handler)
+        logger.propagate = False
+    loggers = file_logger, console_logger, root_logger
+    return loggers
 
 
 def ticker_gatherer(character: str) -> None:
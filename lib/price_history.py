@@ -0,0 +1,211 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from os import SEEK_END, makedirs, path
+from typing import Union
+
+import numpy
+from pandas import DataFrame, MultiIndex, read_csv
+from tqdm import tqdm
+
+HISTORY_DIR = 'data/history'
+FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+INDICATORS = ["SMA 50", "SMA 200", "Volatility 30D", "RSI 14"]
+
+
+def cache_file(ticker: str) -> str:
+    """Path of the append-only file, in which the daily bars of a ticker are stored.
+
+    Args:
+        ticker: Stock ticker.
+
+    Returns:
+        str:
+        Path of the CSV file.
+    """
+    return path.join(HISTORY_DIR, f'{ticker}.csv')
+
+
+def last_cached(ticker: str) -> Union[date, None]:
+    """Reads the date of the last bar in the cache, without loading the whole file.
+
+    Args:
+        ticker: Stock ticker.
+
+    Returns:
+        date:
+        Date of the last cached bar, or ``None`` if the ticker has not been cached yet.
+    """
+    if not path.isfile(filename := cache_file(ticker)):
+        return
+    with open(filename, 'rb') as file:
+        file.seek(0, SEEK_END)
+        position = file.tell() - 2
+        while position > 0:
+            file.seek(position)
+            if file.read(1) == b'\n':
+                break
+            position -= 1
+        line = file.readline().decode().strip()
+    try:
+        return datetime.strptime(line.split(',')[0], '%Y-%m-%d').date()
+    except ValueError:  # only the header is present
+        return
+
+
+def update_cache(tickers: list, batch_size: int = 100, period: str = '1y') -> int:
+    """Downloads the daily bars that are newer than the last cached date, in multi-ticker batches.
+
+    Args:
+        tickers: List of stock tickers.
+        batch_size: Number of tickers requested in a single download.
+        period: Amount of history to download for the tickers that are not cached yet.
+
+    See Also:
+        - Tickers are grouped by the date of their last cached bar, so each batch shares the same start date.
+        - Only completed sessions are cached, so that a partial bar from today is never appended.
+
+    Returns:
+        int:
+        Number of bars appended to the cache.
+    """
+    from yfinance import download
+    makedirs(HISTORY_DIR, exist_ok=True)
+    today = date.today()
+    groups = defaultdict(list)
+    for ticker in tickers:
+        if (last := last_cached(ticker)) is None or last < today - timedelta(days=1):
+            groups[last].append(ticker)
+
+    batches = [(start, group[index:index + batch_size]) for start, group in groups.items()
+               for index in range(0, len(group), batch_size)]
+    appended = 0
+    for start, batch in tqdm(batches, desc='Updating Price History', unit='batch', leave=True):
+        options = {'start': start + timedelta(days=1)} if start else {'period': period}
+        frame = download(tickers=batch, group_by='ticker', auto_adjust=False, progress=False, threads=True, **options)
+        if frame.empty:
+            continue
+        if not isinstance(frame.columns, MultiIndex):
+            frame.columns = MultiIndex.from_product([batch, frame.columns])
+        frame = frame[frame.index.date < today]
+        for ticker in batch:
+            if ticker not in frame.columns.get_level_values(0):
+                continue
+            bars = frame[ticker][FIELDS].dropna(subset=['Close'])
+            if start:
+                bars = bars[bars.index.date > start]
+            if bars.empty:
+                continue
+            filename = cache_file(ticker)
+            bars.to_csv(filename, mode='a', header=not path.isfile(filename), index_label='Date',
+                        date_format='%Y-%m-%d')
+            appended += len(bars)
+    return appended
+
+
+def load_closes(tickers: list, window: int = 252, limit: int = 3) -> DataFrame:
+    """Loads the closing prices of the tickers from the cache, aligned by date.
+
+    Args:
+        tickers: List of stock tickers.
+        window: Number of recent sessions to load.
+        limit: Maximum number of consecutive missing sessions to fill with the previous close.
+
+    See Also:
+        - Tickers without a bar in the last ``limit`` sessions of the frame are stale or delisted, and are left as
+          ``NaN`` instead of being filled forward with a flat price.
+        - Gaps of up to ``limit`` sessions, such as trading halts, are filled with the previous close.
+
+    Returns:
+        DataFrame:
+        Frame indexed by date, with a column of closing prices for each ticker.
+    """
+    closes = {ticker: read_csv(cache_file(ticker), usecols=['Date', 'Close'], index_col='Date')['Close']
+              for ticker in tickers if path.isfile(cache_file(ticker))}
+    if not closes:
+        return DataFrame(columns=tickers)
+    frame = DataFrame(closes).sort_index()
+    frame = frame.loc[:, frame.tail(limit + 1).notna().any()]
+    return frame.ffill(limit=limit).tail(window).reindex(columns=tickers)
+
+
+def sma(prices: numpy.ndarray, days: int) -> numpy.ndarray:
+    """Simple moving average of the last ``days`` sessions, for every ticker at once.
+
+    Args:
+        prices: 2-D array of closing prices with a row for each ticker.
+        days: Number of sessions to average.
+
+    Returns:
+        numpy.ndarray:
+        Moving average for each ticker, ``NaN`` if the history is shorter than ``days``.
+    """
+    if prices.shape[1] < days:
+        return numpy.full(prices.shape[0], numpy.nan)
+    return prices[:, -days:].mean(axis=1)
+
+
+def volatility(prices: numpy.ndarray, days: int = 30) -> numpy.ndarray:
+    """Annualized realized volatility of the daily log returns, for every ticker at once.
+
+    Args:
+        prices: 2-D array of closing prices with a row for each ticker.
+        days: Number of daily returns to use.
+
+    Returns:
+        numpy.ndarray:
+        Volatility for each ticker, ``NaN`` if the history is shorter than ``days``.
+    """
+    if prices.shape[1] <= days:
+        return numpy.full(prices.shape[0], numpy.nan)
+    returns = numpy.diff(numpy.log(prices[:, -(days + 1):]), axis=1)
+    return returns.std(axis=1, ddof=1) * numpy.sqrt(252)
+
+
+def rsi(prices: numpy.ndarray, days: int = 14) -> numpy.ndarray:
+    """Relative strength index using Wilder's smoothing, for every ticker at once.
+
+    Args:
+        prices: 2-D array of closing prices with a row for each ticker.
+        days: Number of sessions for the smoothing.
+
+    See Also:
+        The smoothing of each ticker is seeded with the mean of the first ``days`` changes after its last missing
+        value, so that recently listed tickers and ones with a gap in the cache still have an RSI.
+
+    Returns:
+        numpy.ndarray:
+        RSI for each ticker, ``NaN`` if there are fewer than ``days`` changes after the last missing value.
+    """
+    deltas = numpy.diff(prices, axis=1)
+    valid = ~numpy.isnan(deltas)
+    gains, losses = numpy.clip(numpy.nan_to_num(deltas), 0, None), numpy.clip(-numpy.nan_to_num(deltas), 0, None)
+    count = numpy.zeros(prices.shape[0], dtype=numpy.int64)
+    total_gain, total_loss = numpy.zeros(prices.shape[0]), numpy.zeros(prices.shape[0])
+    average_gain, average_loss = numpy.full(prices.shape[0], numpy.nan), numpy.full(prices.shape[0], numpy.nan)
+    for column in range(deltas.shape[1]):
+        gain, loss = gains[:, column], losses[:, column]
+        count = numpy.where(valid[:, column], count + 1, 0)  # changes since the last missing value
+        total_gain, total_loss = (total_gain + gain) * (count > 0), (total_loss + loss) * (count > 0)
+        seed, smooth = count == days, count > days
+        average_gain = numpy.where(seed, total_gain / days,
+                                   numpy.where(smooth, (average_gain * (days - 1) + gain) / days, numpy.nan))
+        average_loss = numpy.where(seed, total_loss / days,
+                                   numpy.where(smooth, (average_loss * (days - 1) + loss) / days, numpy.nan))
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        return 100 - 100 / (1 + average_gain / average_loss)
+
+
+def technical_indicators(tickers: list) -> dict:
+    """Computes the indicators from the cached closing prices as a 2-D array of tickers and sessions.
+
+    Args:
+        tickers: List of stock tickers.
+
+    Returns:
+        dict:
+        A dictionary of ticker and a list of values in the same order as ``INDICATORS``.
+    """
+    prices = load_closes(tickers=tickers).to_numpy(dtype=numpy.float64).T
+    matrix = numpy.column_stack([sma(prices, 50), sma(prices, 200), volatility(prices), rsi(prices)])
+    return {ticker: [None if numpy.isnan(value) else round(float(value), 2) for value in row]
+            for ticker, row in zip(tickers, matrix)}
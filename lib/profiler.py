@@ -0,0 +1,155 @@
+import json
+import sys
+from collections import Counter, defaultdict
+from cProfile import Profile
+from functools import wraps
+from os import path
+from pstats import Stats
+from threading import Event, Lock, Thread, current_thread
+from threading import enumerate as threads
+from threading import local
+from time import perf_counter, thread_time
+from typing import Callable
+
+
+class Profiler:
+    """Attributes the wall and CPU time of the pipeline stages to each thread, with optional cProfile capture.
+
+    See Also:
+        - ``stage`` wraps a function, timing each call with ``perf_counter`` (wall) and ``thread_time`` (CPU).
+        - Times are inclusive, so a stage that calls another stage includes the time spent in it.
+        - A sampler thread records the stack of every thread at ``interval`` seconds, as collapsed stacks.
+        - ``cprofile`` mode additionally enables ``cProfile`` on each thread while it is inside a stage.
+          Interpreters that allow only one active profiler capture the first thread, the rest are only timed.
+    """
+
+    def __init__(self, mode: str = 'sampling', interval: float = 0.01):
+        self.mode = mode
+        self.interval = interval
+        self.timings = defaultdict(lambda: [0, 0.0, 0.0])
+        self.samples = Counter()
+        self.profiles = []
+        self._lock = Lock()
+        self._local = local()
+        self._stopped = Event()
+        self._sampler = Thread(target=self._sample, name='sampler', daemon=True)
+
+    def start(self) -> None:
+        """Starts the sampler thread."""
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        """Collects the stack of every thread until the profiler is stopped."""
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threads()}
+            for ident, frame in sys._current_frames().items():
+                if ident == self._sampler.ident:
+                    continue
+                stack = []
+                while frame:
+                    code = frame.f_code
+                    stack.append(f'{code.co_name} ({path.basename(code.co_filename)}:{code.co_firstlineno})')
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def _enable(self) -> Profile:
+        """Enables cProfile for the current thread, when it is not already inside a stage."""
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        if self.mode != 'cprofile' or depth:
+            return
+        if not (profile := getattr(self._local, 'profile', None)):
+            profile = self._local.profile = Profile()
+            with self._lock:
+                self.profiles.append(profile)
+        try:
+            profile.enable()
+        except ValueError:  # another thread holds the profiler
+            return
+        return profile
+
+    def _disable(self, profile: Profile) -> None:
+        """Disables cProfile for the current thread, if it was enabled by the outermost stage."""
+        self._local.depth -= 1
+        if profile:
+            profile.disable()
+
+    def stage(self, function: Callable) -> Callable:
+        """Wraps a function to be timed and profiled as a stage of the pipeline.
+
+        Args:
+            function: Function that has to be profiled.
+
+        Returns:
+            Callable:
+            Wrapped function that records the time taken by each call against the function name and thread.
+        """
+        name = function.__name__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            """Records the wall and CPU time of the call."""
+            wall, cpu = perf_counter(), thread_time()
+            profile = self._enable()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._disable(profile)
+                wall, cpu = perf_counter() - wall, thread_time() - cpu
+                with self._lock:
+                    timing = self.timings[name, current_thread().name]
+                    timing[0] += 1
+                    timing[1] += wall
+                    timing[2] += cpu
+
+        return wrapper
+
+    def summary(self) -> list:
+        """Aggregates the timings of each stage along with a break down by thread.
+
+        Returns:
+            list:
+            A list of dictionaries with the stage, thread, number of calls, wall time and CPU time.
+        """
+        stages = defaultdict(lambda: [0, 0.0, 0.0])
+        for (name, _), timing in self.timings.items():
+            stages[name] = [total + value for total, value in zip(stages[name], timing)]
+        rows = []
+        for name, timing in sorted(stages.items(), key=lambda item: item[1][1], reverse=True):
+            breakdown = [(thread, value) for (stage, thread), value in sorted(self.timings.items()) if stage == name]
+            for thread, (calls, wall, cpu) in [('*', timing)] + breakdown:
+                rows.append({'stage': name, 'thread': thread, 'calls': calls,
+                             'wall': round(wall, 4), 'cpu': round(cpu, 4)})
+        return rows
+
+    def stop(self, prefix: str) -> list:
+        """Stops the sampler and writes the stage timings, collapsed stacks and pstats.
+
+        Args:
+            prefix: Path prefix for the files that are written.
+
+        See Also:
+            - ``{prefix}.json``: Wall and CPU time per stage and thread.
+            - ``{prefix}.collapsed``: Collapsed stacks, that can be rendered with ``flamegraph.pl`` or speedscope.
+            - ``{prefix}.pstats``: cProfile statistics of all the threads, only in ``cprofile`` mode.
+
+        Returns:
+            list:
+            List of files that were written.
+        """
+        self._stopped.set()
+        if self._sampler.is_alive():
+            self._sampler.join()
+        files = [f'{prefix}.json', f'{prefix}.collapsed']
+        with open(files[0], 'w') as file:
+            json.dump(self.summary(), file, indent=2)
+        with open(files[1], 'w') as file:
+            file.writelines(f'{stack} {count}\n' for stack, count in self.samples.items())
+        if profiles := [profile for profile in self.profiles if profile.getstats()]:
+            stats = Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(f'{prefix}.pstats')
+            files.append(f'{prefix}.pstats')
+        return files
@@ -0,0 +1,173 @@
+import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from heapq import heappop, heappush
+from os import path
+from random import uniform
+from time import sleep, time
+from typing import Callable, Union
+
+PERMANENT = 'permanent'
+TRANSIENT = 'transient'
+THROTTLED = 'throttled'
+DROPPED = 'dropped'
+
+NEGATIVE_CACHE = 'data/negative_cache.json'
+DELISTED_TTL = 30 * 86_400  # explicit signal, such as a 404 or a payload without a quote type or symbol
+
+
+def status_code(error: Exception) -> Union[int, None]:
+    """Reads the status code of an HTTP error raised by either ``urllib`` or ``requests``.
+
+    Args:
+        error: Exception that was raised while requesting the ticker information.
+
+    Returns:
+        int:
+        Status code of the response, or ``None`` if the error did not come with a response.
+    """
+    return getattr(error, 'code', None) or getattr(getattr(error, 'response', None), 'status_code', None)
+
+
+def classify(error: Exception) -> str:
+    """Classifies a failure that occurred while fetching a stock ticker.
+
+    Args:
+        error: Exception that was raised while requesting the ticker information.
+
+    See Also:
+        - ``404`` and ``410`` responses are permanent, as the ticker is either delisted or never existed.
+        - ``429`` and ``503`` responses are throttled, since the server is asking the client to slow down.
+        - ``5xx`` responses and errors without a status code, such as connection resets and broken chunked encodings
+          are transient.
+        - Any other response is dropped, as a retry will not change the outcome.
+
+    Returns:
+        str:
+        One of ``permanent``, ``transient``, ``throttled`` or ``dropped``.
+    """
+    code = status_code(error=error)
+    if code in (429, 503):
+        return THROTTLED
+    if code in (404, 410):
+        return PERMANENT
+    if code is None or 500 <= code < 600:
+        return TRANSIENT
+    return DROPPED
+
+
+def load_negative_cache(filename: str = NEGATIVE_CACHE) -> dict:
+    """Loads the tickers that failed permanently in previous runs, and are yet to expire.
+
+    Args:
+        filename: Name of the JSON file in which the negative cache is stored.
+
+    Returns:
+        dict:
+        A dictionary of ticker and the epoch time after which it is tried again.
+    """
+    if not path.isfile(filename):
+        return {}
+    with open(filename) as file:
+        try:
+            cache = json.load(file)
+        except json.JSONDecodeError:
+            return {}
+    now = time()
+    return {ticker: expiry for ticker, expiry in cache.items() if expiry > now}
+
+
+def dump_negative_cache(cache: dict, filename: str = NEGATIVE_CACHE) -> None:
+    """Stores the negative cache, so that permanently failed tickers are skipped on later runs.
+
+    Args:
+        cache: Dictionary of ticker and the epoch time after which it is tried again.
+        filename: Name of the JSON file in which the negative cache is stored.
+    """
+    with open(filename, 'w') as file:
+        json.dump(cache, file, indent=2, sort_keys=True)
+
+
+class RetryQueue:
+    """Priority queue that re-processes transient and throttled failures concurrently with an exponential backoff.
+
+    See Also:
+        - Each entry is ordered by the time at which it becomes ready.
+        - Backoff is ``base * 2 ** attempt`` with full jitter, capped at ``max_delay``.
+          Throttled failures have a longer base, so they are retried after the transient ones.
+        - Concurrency is halved every time a throttled failure is seen, and grows back by one for each success.
+    """
+
+    BASE_DELAY = {TRANSIENT: 1, THROTTLED: 10}
+
+    def __init__(self, max_attempts: int = 4, max_delay: int = 120):
+        self.max_attempts = max_attempts
+        self.max_delay = max_delay
+        self.exhausted = []
+        self._heap = []
+
+    def __len__(self) -> int:
+        """Number of tickers waiting to be retried."""
+        return len(self._heap)
+
+    def backoff(self, category: str, attempt: int) -> float:
+        """Calculates the number of seconds to wait before the next attempt.
+
+        Args:
+            category: Category of the failure, either ``transient`` or ``throttled``.
+            attempt: Number of attempts that have been made so far.
+
+        Returns:
+            float:
+            Jittered delay in seconds.
+        """
+        return uniform(0, min(self.max_delay, self.BASE_DELAY[category] * 2 ** attempt))
+
+    def put(self, ticker: str, category: str, attempt: int = 0) -> None:
+        """Adds a ticker to the queue, or to the list of exhausted tickers when it is out of attempts.
+
+        Args:
+            ticker: Stock ticker that failed.
+            category: Category of the failure, either ``transient`` or ``throttled``.
+            attempt: Number of attempts that have been made so far.
+        """
+        if attempt >= self.max_attempts:
+            self.exhausted.append(ticker)
+            return
+        heappush(self._heap, (time() + self.backoff(category, attempt), ticker, attempt, category))
+
+    def process(self, function: Callable[[str], Union[str, None]], max_workers: int = 10) -> None:
+        """Drains the queue using a pool of threads, submitting each ticker as soon as its backoff expires.
+
+        Args:
+            function: Callable that takes a ticker and returns the category of failure or ``None`` on success.
+            max_workers: Maximum number of threads in the pool.
+
+        See Also:
+            Starts with half the workers, if any of the queued tickers were throttled.
+        """
+        pending = {}
+        limit = max(1, max_workers // 2) if any(entry[-1] == THROTTLED for entry in self._heap) else max_workers
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            while self._heap or pending:
+                while self._heap and self._heap[0][0] <= time() and len(pending) < limit:
+                    _, ticker, attempt, _ = heappop(self._heap)
+                    pending[executor.submit(function, ticker)] = ticker, attempt
+                if self._heap and len(pending) < limit:
+                    timeout = max(self._heap[0][0] - time(), 0)
+                else:
+                    timeout = None
+                if not pending:
+                    sleep(timeout)
+                    continue
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    ticker, attempt = pending.pop(future)
+                    if (category := future.result()) == THROTTLED:
+                        limit = max(1, limit // 2)
+                    elif category is None:
+                        limit = min(max_workers, limit + 1)
+                    if category in (TRANSIENT, THROTTLED):
+                        self.put(ticker=ticker, category=category, attempt=attempt + 1)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
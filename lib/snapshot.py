@@ -0,0 +1,214 @@
+"""Fixed schema binary snapshot of the analyzed stocks, which can be memory mapped by readers without copying.
+
+Layout:
+    - Header: magic, version, number of rows followed by the byte offset of each block.
+    - String tables: ``int32`` offsets (rows + 1) followed by a ``utf-8`` blob, for each text column.
+    - Float block: ``float64`` column major array, each column is contiguous. Missing values are ``NaN``.
+      Technical indicators are ``NaN`` when the price history stage was not run.
+    - Int block: ``int32`` column major array, each column is contiguous. Missing values are ``-1``.
+
+Every block starts at a 64 byte boundary, so that the arrays can be viewed directly on top of ``numpy.memmap``.
+"""
+
+from struct import calcsize, pack, unpack_from
+from typing import Union
+
+import numpy
+
+MAGIC = b'THOR'
+VERSION = 2
+ALIGNMENT = 64
+
+STRING_COLUMNS = ["Stock Ticker", "Stock Name", "Industry"]
+FLOAT_COLUMNS = ["Market Capital", "Dividend Yield", "PE Ratio", "PB Ratio", "Current Price", "Today's High",
+                 "Today's Low", "52W High", "52W Low", "5Y Dividend Yield", "Profit Margin", "Rating",
+                 "SMA 50", "SMA 200", "Volatility 30D", "RSI 14"]
+INT_COLUMNS = ["Employees"]
+
+# magic, version, reserved, rows, followed by an offset for each string table, its blob, float block and int block
+HEADER = f'<4sHHI{2 * len(STRING_COLUMNS) + 2}Q'
+HEADER_SIZE = ALIGNMENT * -(-calcsize(HEADER) // ALIGNMENT)
+
+SUFFIXES = {'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12}
+
+
+def denumerize(value: Union[str, int, float, None]) -> Union[float, None]:
+    """Converts a value formatted by ``numerize`` back to a number.
+
+    Args:
+        value: Formatted value. Example: ``568.15M``
+
+    Returns:
+        float:
+        Numeric value. Example: ``568150000.0``
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if value[-1] in SUFFIXES:
+        return float(value[:-1]) * SUFFIXES[value[-1]]
+    return float(value)
+
+
+def _align(offset: int) -> int:
+    """Rounds up the offset to the next block boundary."""
+    return ALIGNMENT * -(-offset // ALIGNMENT)
+
+
+def _string_table(values: list) -> tuple:
+    """Encodes a list of strings into an offsets array and a blob."""
+    encoded = [(value or '').encode('utf-8') for value in values]
+    offsets = numpy.zeros(len(encoded) + 1, dtype=numpy.int32)
+    numpy.cumsum([len(value) for value in encoded], out=offsets[1:])
+    return offsets, b''.join(encoded)
+
+
+def write_snapshot(mapping_dict: dict, filename: str, headers: list) -> int:
+    """Writes the analyzed stocks into a binary snapshot.
+
+    Args:
+        mapping_dict: Dictionary of stock ticker and the list of values returned by ``extract_data``.
+        filename: Name of the snapshot file.
+        headers: Column names in the same order as the values in ``mapping_dict``, prefixed by the ticker.
+
+    See Also:
+        - Rows are written sorted by stock ticker.
+        - Numeric values are stored as is, values formatted by ``numerize`` are converted back with ``denumerize``.
+
+    Returns:
+        int:
+        Returns the number of rows written.
+    """
+    mapping_dict = dict(sorted(mapping_dict.items()))
+    rows = len(mapping_dict)
+    position = {name: index for index, name in enumerate(headers[1:])}
+    values = list(mapping_dict.values())
+
+    tables = [_string_table(list(mapping_dict))]
+    tables += [_string_table([value[position[name]] for value in values]) for name in STRING_COLUMNS[1:]]
+
+    floats = numpy.full((len(FLOAT_COLUMNS), rows), numpy.nan, dtype=numpy.float64)
+    for column, name in enumerate(FLOAT_COLUMNS):
+        if name not in position:
+            continue
+        floats[column] = [numpy.nan if (val := denumerize(value[position[name]])) is None else val
+                          for value in values]
+    ints = numpy.full((len(INT_COLUMNS), rows), -1, dtype=numpy.int32)
+    for column, name in enumerate(INT_COLUMNS):
+        ints[column] = [-1 if (val := denumerize(value[position[name]])) is None else val for value in values]
+
+    blocks, offsets, offset = [], [], HEADER_SIZE
+    for block in [part for table in tables for part in table] + [floats, ints]:
+        offset = _align(offset)
+        block = block.tobytes() if isinstance(block, numpy.ndarray) else block
+        blocks.append((offset, block))
+        offsets.append(offset)
+        offset += len(block)
+
+    with open(filename, 'wb') as file:
+        file.write(pack(HEADER, MAGIC, VERSION, 0, rows, *offsets).ljust(HEADER_SIZE, b'\0'))
+        for start, block in blocks:
+            file.seek(start)
+            file.write(block)
+        file.truncate(offset)  # extends the file to the end of the last block, even when trailing blocks are empty
+    return rows
+
+
+class Snapshot:
+    """Memory mapped reader for a binary snapshot.
+
+    See Also:
+        - Opening a snapshot only parses the header, every column is a zero-copy view on top of the mapped file.
+        - Processes reading the same snapshot share a single copy through the page cache.
+    """
+
+    def __init__(self, filename: str):
+        self.buffer = numpy.memmap(filename, dtype=numpy.uint8, mode='r')
+        magic, version, _, self.rows, *offsets = unpack_from(HEADER, self.buffer)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{filename} is not a version {VERSION} snapshot.')
+        self._tables = {}
+        for index, name in enumerate(STRING_COLUMNS):
+            table, blob = offsets[2 * index], offsets[2 * index + 1]
+            self._tables[name] = self._view(numpy.int32, (self.rows + 1,), table), blob
+        self.floats = self._view(numpy.float64, (len(FLOAT_COLUMNS), self.rows), offsets[-2])
+        self.ints = self._view(numpy.int32, (len(INT_COLUMNS), self.rows), offsets[-1])
+        self._index = None
+
+    def _view(self, dtype: type, shape: tuple, offset: int) -> numpy.ndarray:
+        """Creates a read-only array on top of the mapped buffer without copying."""
+        return numpy.ndarray(shape=shape, dtype=dtype, buffer=self.buffer, offset=offset)
+
+    def __len__(self) -> int:
+        """Number of stock tickers in the snapshot."""
+        return self.rows
+
+    def string(self, name: str, row: int) -> str:
+        """Decodes a single value from a string table.
+
+        Args:
+            name: Name of the string column.
+            row: Row number.
+
+        Returns:
+            str:
+            Decoded value.
+        """
+        offsets, blob = self._tables[name]
+        return bytes(self.buffer[blob + offsets[row]:blob + offsets[row + 1]]).decode('utf-8')
+
+    def strings(self, name: str) -> list:
+        """Decodes all the values of a string column.
+
+        Args:
+            name: Name of the string column.
+
+        Returns:
+            list:
+            List of decoded values.
+        """
+        offsets, blob = self._tables[name]
+        data = bytes(self.buffer[blob:blob + offsets[-1]])
+        return [data[start:end].decode('utf-8') for start, end in zip(offsets[:-1], offsets[1:])]
+
+    def column(self, name: str) -> Union[numpy.ndarray, list]:
+        """Returns a column by its name.
+
+        Args:
+            name: Name of the column as in the spreadsheet header.
+
+        Returns:
+            Union[numpy.ndarray, list]:
+            Zero-copy view for numeric columns, or a list of decoded values for string columns.
+        """
+        if name in FLOAT_COLUMNS:
+            return self.floats[FLOAT_COLUMNS.index(name)]
+        if name in INT_COLUMNS:
+            return self.ints[INT_COLUMNS.index(name)]
+        return self.strings(name)
+
+    def row(self, ticker: str) -> int:
+        """Looks up the row number of a stock ticker.
+
+        Args:
+            ticker: Stock ticker.
+
+        Returns:
+            int:
+            Row number in the snapshot.
+        """
+        if self._index is None:
+            self._index = {value: row for row, value in enumerate(self.strings(STRING_COLUMNS[0]))}
+        return self._index[ticker]
+
+    def to_frame(self, headers: list):
+        """Loads the snapshot into a ``DataFrame`` with the columns in the same order as the spreadsheet.
+
+        Args:
+            headers: Column names for the frame.
+
+        Returns:
+            DataFrame:
+            Frame with all the columns in the snapshot.
+        """
+        from pandas import DataFrame
+        return DataFrame({name: self.column(name) for name in headers})
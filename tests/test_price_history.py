@@ -0,0 +1,85 @@
+import math
+from datetime import date
+
+import pytest
+
+numpy = pytest.importorskip('numpy')
+pytest.importorskip('pandas')
+
+from lib import price_history  # noqa: E402
+from lib.price_history import (last_cached, load_closes, rsi,  # noqa: E402
+                               sma, volatility)
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch):
+    """Points the cache to a temporary directory, and returns a function to write the closes of a ticker."""
+    monkeypatch.setattr(price_history, 'HISTORY_DIR', str(tmp_path))
+
+    def write(ticker: str, closes: dict) -> None:
+        """Writes the closing prices in the same format as ``update_cache``."""
+        with open(tmp_path / f'{ticker}.csv', 'w') as file:
+            file.write('Date,Open,High,Low,Close,Volume\n')
+            file.writelines(f'{day},{close},{close},{close},{close},100\n' for day, close in closes.items())
+
+    return write
+
+
+def test_last_cached(history):
+    """Date of the last bar is read from the tail of the file."""
+    assert last_cached('NONE') is None
+    history('EMPTY', {})
+    assert last_cached('EMPTY') is None
+    history('AAPL', {'2024-01-02': 1.0, '2024-01-03': 2.0})
+    assert last_cached('AAPL') == date(2024, 1, 3)
+
+
+def test_load_closes(history):
+    """Closes are aligned by date, short gaps are filled, and stale or missing tickers are left empty."""
+    days = [f'2024-01-{day:02d}' for day in range(1, 11)]
+    history('AAPL', {day: float(index) for index, day in enumerate(days)})
+    history('GAP', {day: 5.0 for index, day in enumerate(days) if index not in (4, 5)})
+    history('STALE', {day: 1.0 for day in days[:5]})
+    frame = load_closes(tickers=['AAPL', 'GAP', 'STALE', 'NONE'], window=8, limit=3)
+    assert list(frame.columns) == ['AAPL', 'GAP', 'STALE', 'NONE']
+    assert len(frame) == 8
+    assert frame['AAPL'].iloc[-1] == 9.0
+    assert frame['GAP'].notna().all()
+    assert frame['STALE'].isna().all()
+    assert frame['NONE'].isna().all()
+
+
+def test_sma():
+    """Average of the last sessions, or ``NaN`` when the history is too short."""
+    prices = numpy.array([[1.0, 2.0, 3.0, 4.0], [2.0, 2.0, 2.0, 2.0]])
+    assert sma(prices, 2).tolist() == [3.5, 2.0]
+    assert numpy.isnan(sma(prices, 5)).all()
+
+
+def test_volatility():
+    """Constant prices have no volatility, and a short history has none to report."""
+    prices = numpy.vstack([numpy.full(40, 10.0), 10 * numpy.exp(numpy.arange(40) * 0.01 * (-1) ** numpy.arange(40))])
+    result = volatility(prices, days=30)
+    assert result[0] == 0
+    assert result[1] > 0
+    assert numpy.isnan(volatility(prices[:, :30], days=30)).all()
+
+
+def test_rsi():
+    """Rising prices have an RSI of 100, falling prices 0, and alternating equal moves 50."""
+    prices = numpy.vstack([numpy.arange(30.0), numpy.arange(30.0)[::-1], 10 + (numpy.arange(30) % 2)])
+    result = rsi(prices, days=14)
+    assert result[0] == 100
+    assert result[1] == 0
+    assert math.isclose(result[2], 50, abs_tol=5)
+
+
+def test_rsi_missing_values():
+    """RSI is seeded after the last missing value, and is ``NaN`` only when fewer than ``days`` changes remain."""
+    rising = numpy.arange(252.0)
+    recent = numpy.where(numpy.arange(252) < 152, numpy.nan, rising)
+    short = numpy.where(numpy.arange(252) < 245, numpy.nan, rising)
+    result = rsi(numpy.vstack([rising, recent, short]), days=14)
+    assert result[0] == 100
+    assert result[1] == 100
+    assert numpy.isnan(result[2])
@@ -0,0 +1,131 @@
+import json
+from threading import Lock
+from time import sleep, time
+from types import SimpleNamespace
+from urllib.error import HTTPError
+
+import pytest
+
+from lib.retry_queue import (DROPPED, PERMANENT, THROTTLED, TRANSIENT,
+                             RetryQueue, classify, dump_negative_cache,
+                             load_negative_cache, status_code)
+
+
+class ResponseError(Exception):
+    """Mimics ``requests.exceptions.HTTPError``, which carries the status code in its response."""
+
+    def __init__(self, code: int):
+        super().__init__(f'{code} Error')
+        self.response = SimpleNamespace(status_code=code)
+
+
+@pytest.fixture
+def no_delay(monkeypatch):
+    """Makes every retry ready as soon as it is queued."""
+    monkeypatch.setattr(RetryQueue, 'BASE_DELAY', {TRANSIENT: 0, THROTTLED: 0})
+
+
+@pytest.mark.parametrize('code, category', [(404, PERMANENT), (410, PERMANENT), (429, THROTTLED), (503, THROTTLED),
+                                            (500, TRANSIENT), (502, TRANSIENT), (400, DROPPED), (401, DROPPED)])
+def test_classify(code, category):
+    """Errors from ``urllib`` and ``requests`` are classified by their status code."""
+    assert classify(HTTPError('https://finance.yahoo.com', code, 'Error', {}, None)) == category
+    assert classify(ResponseError(code)) == category
+
+
+def test_classify_without_response():
+    """Errors without a status code, such as connection resets are transient."""
+    assert status_code(ConnectionResetError()) is None
+    assert classify(ConnectionResetError()) == TRANSIENT
+
+
+def test_negative_cache(tmp_path):
+    """Only the entries that are yet to expire are loaded back."""
+    filename = str(tmp_path / 'negative_cache.json')
+    assert load_negative_cache(filename=filename) == {}
+    dump_negative_cache(cache={'GONE': time() + 60, 'OLD': time() - 60}, filename=filename)
+    assert list(load_negative_cache(filename=filename)) == ['GONE']
+    with open(filename, 'w') as file:
+        file.write('{')
+    assert load_negative_cache(filename=filename) == {}
+
+
+def test_negative_cache_sorted(tmp_path):
+    """Tickers are stored sorted, so that the file is stable across runs."""
+    filename = str(tmp_path / 'negative_cache.json')
+    dump_negative_cache(cache={'ZZ': 1.0, 'AA': 2.0}, filename=filename)
+    with open(filename) as file:
+        assert list(json.load(file)) == ['AA', 'ZZ']
+
+
+def test_backoff():
+    """Backoff grows exponentially with the attempt, and never exceeds the maximum delay."""
+    queue = RetryQueue(max_delay=30)
+    for attempt in range(10):
+        delay = queue.backoff(category=THROTTLED, attempt=attempt)
+        assert 0 <= delay <= min(30, RetryQueue.BASE_DELAY[THROTTLED] * 2 ** attempt)
+
+
+def test_put_exhausted():
+    """Tickers that are out of attempts are not queued."""
+    queue = RetryQueue(max_attempts=2)
+    queue.put(ticker='AAPL', category=TRANSIENT, attempt=1)
+    queue.put(ticker='MSFT', category=TRANSIENT, attempt=2)
+    assert len(queue) == 1
+    assert queue.exhausted == ['MSFT']
+
+
+def test_process_success(no_delay):
+    """Tickers are retried until the function succeeds."""
+    calls = {}
+
+    def function(ticker: str):
+        """Fails twice before succeeding."""
+        calls[ticker] = calls.get(ticker, 0) + 1
+        return None if calls[ticker] > 2 else TRANSIENT
+
+    queue = RetryQueue(max_attempts=4)
+    for ticker in ('AAPL', 'MSFT'):
+        queue.put(ticker=ticker, category=TRANSIENT)
+    queue.process(function=function, max_workers=2)
+    assert calls == {'AAPL': 3, 'MSFT': 3}
+    assert not queue and not queue.exhausted
+
+
+def test_process_exhausted(no_delay):
+    """Tickers that keep failing are retried until they run out of attempts, while dropped ones are not retried."""
+    calls = {}
+
+    def function(ticker: str):
+        """Fails every time."""
+        calls[ticker] = calls.get(ticker, 0) + 1
+        return DROPPED if ticker == 'BAD' else TRANSIENT
+
+    queue = RetryQueue(max_attempts=3)
+    for ticker in ('AAPL', 'BAD'):
+        queue.put(ticker=ticker, category=TRANSIENT)
+    queue.process(function=function, max_workers=2)
+    assert calls == {'AAPL': 3, 'BAD': 1}
+    assert queue.exhausted == ['AAPL']
+
+
+def test_process_throttled(no_delay):
+    """Throttled tickers are retried with half the workers, and concurrency drops further as throttling continues."""
+    lock, active, peak = Lock(), [0], [0]
+
+    def function(_: str):
+        """Tracks the number of concurrent calls."""
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        sleep(0.01)
+        with lock:
+            active[0] -= 1
+        return THROTTLED
+
+    queue = RetryQueue(max_attempts=2)
+    for index in range(8):
+        queue.put(ticker=f'T{index}', category=THROTTLED)
+    queue.process(function=function, max_workers=4)
+    assert peak[0] <= 2
+    assert len(queue.exhausted) == 8
@@ -0,0 +1,56 @@
+import math
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from lib.snapshot import Snapshot, write_snapshot  # noqa: E402
+
+HEADERS = ["Stock Ticker", "Stock Name", "Market Capital", "Dividend Yield", "PE Ratio", "PB Ratio", "Current Price",
+           "Today's High", "Today's Low", "52W High", "52W Low", "5Y Dividend Yield", "Profit Margin", "Industry",
+           "Employees", "Rating"]
+
+
+def test_round_trip(tmp_path):
+    """Values are read back as is and sorted by ticker, with missing values as ``NaN``, ``-1`` or empty strings."""
+    mapping = {
+        'XYZ': ['X Corp', None, None, None, None, None, None, None, None, None, None, None, None, None, None],
+        'AAPL': ['Apple Inc.', 2_512_345_678_901, 0.5, 30.1, 40.2, 150.0, 151.0, 149.0, 180.0, 120.0, 1.1, 0.25,
+                 'Consumer Électronique', 154_321, 2.0]
+    }
+    filename = str(tmp_path / 'stocks.snap')
+    assert write_snapshot(mapping_dict=mapping, filename=filename, headers=HEADERS) == 2
+
+    snapshot = Snapshot(filename)
+    assert len(snapshot) == 2
+    assert snapshot.strings('Stock Ticker') == ['AAPL', 'XYZ']
+    assert snapshot.string('Industry', 0) == 'Consumer Électronique'
+    assert snapshot.string('Industry', 1) == ''
+    assert snapshot.column('Market Capital')[0] == 2_512_345_678_901
+    assert math.isnan(snapshot.column('Market Capital')[1])
+    assert list(snapshot.column('Employees')) == [154_321, -1]
+    assert math.isnan(snapshot.column('SMA 50')[0])
+    assert snapshot.row('XYZ') == 1
+
+
+def test_numerized(tmp_path):
+    """Values formatted by ``numerize`` are converted back to numbers."""
+    mapping = {'AAPL': ['Apple Inc.', '2.5T', *[None] * 11, '154K', None]}
+    filename = str(tmp_path / 'numerized.snap')
+    write_snapshot(mapping_dict=mapping, filename=filename, headers=HEADERS)
+
+    snapshot = Snapshot(filename)
+    assert snapshot.column('Market Capital')[0] == 2.5e12
+    assert snapshot.column('Employees')[0] == 154_000
+
+
+def test_empty(tmp_path):
+    """A snapshot without any rows can be read back."""
+    filename = str(tmp_path / 'empty.snap')
+    assert write_snapshot(mapping_dict={}, filename=filename, headers=HEADERS) == 0
+
+    snapshot = Snapshot(filename)
+    assert len(snapshot) == 0
+    assert snapshot.strings('Stock Ticker') == []
+    assert snapshot.column('Rating').size == 0
+    assert snapshot.column('Employees').size == 0
@@ -1,24 +1,29 @@
-from concurrent.futures import ThreadPoolExecutor
+from argparse import ArgumentParser
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from contextlib import closing
 from datetime import datetime
 from http.server import HTTPServer, SimpleHTTPRequestHandler
+from itertools import islice
 from os import getpid, mkdir, path, system
+from queue import Full, Queue, SimpleQueue
 from socket import (AF_INET, SO_REUSEADDR, SOCK_DGRAM, SOCK_STREAM, SOL_SOCKET,
                     gethostbyname, socket)
-from time import perf_counter
+from threading import Event, Thread
+from time import perf_counter, time
 from typing import Union
 from urllib.error import HTTPError
 
 from _curses import error
 from numerize.numerize import numerize
-from pandas import read_excel
 from pick import pick
 from psutil import Process
 from requests.exceptions import ChunkedEncodingError, ConnectionError
+from requests.exceptions import HTTPError as RequestsHTTPError
 from tqdm import tqdm
 from urllib3.exceptions import ProtocolError
 from xlsxwriter import Workbook
 from yfinance import Ticker
+from yfinance.exceptions import YFRateLimitError
 
 if not path.isdir('logs'):
     mkdir('logs')
@@ -33,18 +38,19 @@ def sort_by_value(data: dict, sort: int) -> dict:
         data: Dictionary which has to be sorted.
         sort: Index value of the list in the ``value`` of the dictionary.
 
+    See Also:
+        Missing values are sorted as ``999_999`` without being modified, so the same data can be used in other views.
+
     Returns:
         dict:
         Returns the dictionary which is sorted by a particular element in the list of values.
     """
     column_name = headers[1:][sort]
     console_logger.info(f'Spreadsheet will be sorted by {column_name}')
-    for key, value in data.items():
-        if not value[sort]:
-            value[sort] = 999_999
-            data[key] = value
     reverse_flag = False if column_name == 'Rating' else True
-    return dict(sorted(data.items(), key=lambda element: element[1][sort], reverse=reverse_flag))
+    if column_name in ('Stock Name', 'Industry'):
+        return dict(sorted(data.items(), key=lambda element: element[1][sort] or '', reverse=reverse_flag))
+    return dict(sorted(data.items(), key=lambda element: element[1][sort] or 999_999, reverse=reverse_flag))
 
 
 def columns() -> list:
@@ -74,24 +80,112 @@ def columns() -> list:
     ]
 
 
-def worksheet_initializer() -> None:
-    """Creates header in each column."""
-    worksheet.write(0, 0, headers[0])
-    worksheet.write(0, 1, headers[1])
-    worksheet.write(0, 2, headers[2])
-    worksheet.write(0, 3, headers[3])
-    worksheet.write(0, 4, headers[4])
-    worksheet.write(0, 5, headers[5])
-    worksheet.write(0, 6, headers[6])
-    worksheet.write(0, 7, headers[7])
-    worksheet.write(0, 8, headers[8])
-    worksheet.write(0, 9, headers[9])
-    worksheet.write(0, 10, headers[10])
-    worksheet.write(0, 11, headers[11])
-    worksheet.write(0, 12, headers[12])
-    worksheet.write(0, 13, headers[13])
-    worksheet.write(0, 14, headers[14])
-    worksheet.write(0, 15, headers[15])
+def screeners() -> dict:
+    """Filters that are applied on the analyzed stocks, each of which is written to a worksheet of its own.
+
+    Returns:
+        dict:
+        A dictionary of sheet name and a function that takes the list of values and returns a boolean.
+    """
+    index = {name: position for position, name in enumerate(headers[1:])}
+
+    def value_picks(value: list) -> bool:
+        """Stocks with a forward PE ratio below 15 and a PB ratio below 1.5."""
+        return bool(value[index['PE Ratio']] and value[index['PB Ratio']] and
+                    0 < value[index['PE Ratio']] < 15 and 0 < value[index['PB Ratio']] < 1.5)
+
+    def dividend_growth(value: list) -> bool:
+        """Stocks with a dividend yield higher than their 5-year average."""
+        return bool(value[index['Dividend Yield']] and value[index['5Y Dividend Yield']] and
+                    value[index['Dividend Yield']] > value[index['5Y Dividend Yield']])
+
+    def analyst_buys(value: list) -> bool:
+        """Stocks with an analyst recommendation rating of buy or better."""
+        return bool(value[index['Rating']] and value[index['Rating']] <= 2)
+
+    return {'Value Picks': value_picks, 'Dividend Growth': dividend_growth, 'Analyst Buys': analyst_buys}
+
+
+def sheet_name(name: str, used: set) -> str:
+    """Converts a value into a valid and unique worksheet name.
+
+    Args:
+        name: Name that has to be used for the worksheet.
+        used: Names that are already used in the workbook.
+
+    Returns:
+        str:
+        Name without the characters that are not allowed and within the 31 characters limit.
+    """
+    name = base = ''.join('-' if char in '[]:*?/\\' else char for char in name)[:31]
+    suffix = 1
+    while name.lower() in used:
+        suffix += 1
+        name = f'{base[:31 - len(str(suffix)) - 1]}~{suffix}'
+    used.add(name.lower())
+    return name
+
+
+def sheet_views(mapping_dict: dict, sort_keys: list) -> list:
+    """Lists the worksheets that have to be created from the analyzed stocks.
+
+    Args:
+        mapping_dict: Takes a dictionary as argument.
+        sort_keys: Index values of the columns chosen to sort the spreadsheet.
+
+    Returns:
+        list:
+        A list of tuples with the sheet name, the type of view and its argument.
+    """
+    used = set()
+    views = [(sheet_name('Results', used), 'all', None)]
+    views += [(sheet_name(f'By {headers[1:][sort]}', used), 'sort', sort) for sort in sort_keys]
+    views += [(sheet_name(name, used), 'screener', name) for name in screeners()]
+    industries = sorted({value[headers[1:].index('Industry')] for value in mapping_dict.values()} - {None})
+    views += [(sheet_name(industry, used), 'industry', industry) for industry in industries]
+    return views
+
+
+def sheet_row(ticker: str, value: list) -> list:
+    """Converts the extracted values of a stock ticker into a row of the spreadsheet.
+
+    Args:
+        ticker: Stock ticker.
+        value: List of values returned by ``extract_data``.
+
+    Returns:
+        list:
+        Row with ``Market Capital`` and ``Employees`` formatted by ``numerize``.
+    """
+    row = [ticker, *value]
+    for position in (headers.index('Market Capital'), headers.index('Employees')):
+        row[position] = numerize(row[position]) if row[position] else None
+    return row
+
+
+def sheet_payload(mapping_dict: dict, view: tuple) -> tuple:
+    """Prepares the rows of a worksheet, which are generated only as they are written.
+
+    Args:
+        mapping_dict: Takes a dictionary as argument.
+        view: Tuple of sheet name, type of view and its argument.
+
+    Returns:
+        tuple:
+        A tuple of the sheet name and a generator of the rows to be written.
+    """
+    name, kind, argument = view
+    if kind == 'sort':
+        data = sort_by_value(data=mapping_dict, sort=argument)
+    elif kind == 'screener':
+        screener = screeners()[argument]
+        data = {ticker: value for ticker, value in mapping_dict.items() if screener(value)}
+    elif kind == 'industry':
+        position = headers[1:].index('Industry')
+        data = {ticker: value for ticker, value in mapping_dict.items() if value[position] == argument}
+    else:
+        data = mapping_dict
+    return name, (sheet_row(ticker=ticker, value=value) for ticker, value in data.items())
 
 
 def make_float(val: int or float) -> float:
@@ -113,6 +207,10 @@ def extract_data(data: dict) -> Union[list, None]:
     Args:
         data: Takes the information of each ticker value as an argument.
 
+    See Also:
+        ``Market Capital`` and ``Number of Employees`` are retained as numbers, and are formatted by ``numerize`` only
+        when written to the spreadsheet.
+
     Returns:
         list:
         A list of ``Stock Name``, ``Market Capital``, ``Dividend Yield``, ``PE Ratio``, ``PB Ratio``,
@@ -121,8 +219,7 @@ def extract_data(data: dict) -> Union[list, None]:
     """
     stock_name = data.get('shortName')
 
-    cap = data.get('marketCap')
-    capital = numerize(cap) if cap else None
+    capital = data.get('marketCap') or None
 
     div_yield = data.get('dividendYield')
     dividend_yield = make_float(div_yield) if div_yield else None
@@ -156,8 +253,7 @@ def extract_data(data: dict) -> Union[list, None]:
 
     industry = data.get('industry')
 
-    fte = data.get('fullTimeEmployees')
-    employees = numerize(fte) if fte else None
+    employees = data.get('fullTimeEmployees') or None
 
     recommendation = data.get('recommendationMean')
     rating = float(recommendation) if recommendation else None
@@ -168,76 +264,162 @@ def extract_data(data: dict) -> Union[list, None]:
     if stock_name and any(stock_data):
         return stock_data
     else:
-        file_logger.error(f"Unable to extract necessary information for analyzing {data.get('symbol')}")
+        file_logger.error(f"Unable to extract necessary information for analyzing {data.get('symbol')}",
+                          extra={'ticker': data.get('symbol')})
 
 
-def analyzer(stock: str) -> None:
-    """Gathers all the necessary details from each stock ticker. Calls ``extract_data()`` to get specifics.
+def fetch(stock: str) -> dict:
+    """Requests the information of a stock ticker, which is timed as a stage of its own while profiling.
+
+    Args:
+        stock: Takes stock ticker value as argument.
+
+    Returns:
+        dict:
+        Information of the stock ticker as returned by Yahoo Finance.
+    """
+    return Ticker(stock).info
+
+
+def enqueue(stock: str, info: dict) -> Union[str, None]:
+    """Hands the information over to ``extractor()``, which is timed as a stage of its own while profiling.
+
+    Args:
+        stock: Takes stock ticker value as argument.
+        info: Information of the stock ticker.
+
+    See Also:
+        - Blocks when the ``payloads`` queue is full, so that fetching never runs ahead of extraction.
+        - Stops waiting and drops the ticker, if the extractor has stopped.
+
+    Returns:
+        str:
+        ``dropped`` if the extractor has stopped, ``None`` otherwise.
+    """
+    while not extraction_stopped.is_set():
+        try:
+            payloads.put((stock, info), timeout=1)
+            return
+        except Full:
+            continue
+    file_logger.error(f'Extractor has stopped, dropping {stock}.', extra={'ticker': stock})
+    return DROPPED
+
+
+def analyzer(stock: str) -> Union[str, None]:
+    """Gathers all the necessary details from each stock ticker and queues them for ``extractor()``.
 
     Args:
         stock: Takes stock ticker value as argument.
 
     See Also:
         - Captures the number of ``404`` responses in a global variable.
-        - Exits if a ``503`` is received or if 50% requests returned a ``404``, with less than 20% of ``200`` response.
+        - Exits if 50% requests returned a ``404``, with less than 20% of ``200`` response.
+        - Rate limit errors from ``yfinance`` are throttled, HTTP errors from ``urllib`` and ``requests`` are classified
+          by their status code.
+        - Tickers that are ``404`` are held in ``not_found``, and are stored in the negative cache at the end of a run
+          that did not end in an IP range denial.
+        - Queues the information using ``enqueue()``, which blocks while the ``payloads`` queue is full.
         - ``503`` response is received only during either of the following scenarios:
 
             - ``max_workers`` in ThreadPool is increased beyond 20.
             - Script is run repeatedly with short intervals.
+
+    Returns:
+        str:
+        Category of the failure (``permanent``, ``transient``, ``throttled`` or ``dropped``) or ``None`` if fetched.
     """
     global count_404, printed
     try:
-        stock_data = extract_data(data=Ticker(stock).info)
-        if stock_data:
-            stock_map.update({stock: stock_data})
-    except HTTPError as err:
-        # A 503 response or 50% 404 response with only 20% processed requests indicates an IP range denial
-        if err.code == 503 or (count_404 > 50 * overall / 100 and len(stock_map) < 20 * overall / 100):
+        info = fetch(stock=stock)
+    except YFRateLimitError as err:
+        file_logger.error(f'Failed to analyze {stock}. {err} Marked as {THROTTLED}.', extra={'ticker': stock})
+        return THROTTLED
+    except (HTTPError, RequestsHTTPError) as err:
+        url = getattr(err, 'url', None) or getattr(err.response, 'url', None) or ''
+        # 50% 404 response with only 20% processed requests indicates an IP range denial
+        if count_404 > 50 * overall / 100 and len(stock_map) < 20 * overall / 100:
             root_logger.error(f'\nNoticing repeated 404s, which indicates an IP range denial by '
-                              f'{"/".join(err.url.split("/")[:3])}\nPlease wait for a while before re-running this '
+                              f'{"/".join(url.split("/")[:3])}\nPlease wait for a while before re-running this '
                               'code. Also, reduce number of max_workers in concurrency and consider switching to a '
                               'new Network ID.') if not printed else None
             printed = True  # makes sure the print statement happens only once
             # stop future threads to avoid progress bar on screen post print
             raise ConnectionRefusedError  # handle exception so that spreadsheet is created with existing stock_map dict
-        else:
-            if err.code == 404:
-                count_404 += 1  # increases count_404 for future handling
-            file_logger.error(f'Failed to analyze {stock}. Faced error code {err.code} while requesting {err.url}. '
-                              f'Reason: {err.reason}.')
+        if (category := classify(error=err)) == PERMANENT:
+            count_404 += 1  # increases count_404 for future handling
+            not_found[stock] = time() + DELISTED_TTL
+        file_logger.error(f'Failed to analyze {stock}. Faced error code {status_code(error=err)} while requesting '
+                          f'{url}. Reason: {err}. Marked as {category}.', extra={'ticker': stock})
+        return category
     except (ConnectionError, ProtocolError, ConnectionResetError, ChunkedEncodingError) as conn_err:
-        file_logger.error(f'Failed to analyze {stock}.\n{conn_err}')
+        file_logger.error(f'Failed to analyze {stock}.\n{conn_err}', extra={'ticker': stock})
+        return TRANSIENT
+    return enqueue(stock=stock, info=info)
 
 
-def writer(mapping_dict: dict) -> int:
-    """Writes the global variable value ``{stock_map}`` to a spreadsheet.
+def extractor() -> None:
+    """Consumes the ``payloads`` queue until a ``None`` is received, and stores the extracted data in ``stock_map``.
+
+    See Also:
+        - Only the extracted values are retained, the raw information is dropped as soon as it is processed.
+        - Tickers with information but without a ``quoteType`` or ``symbol`` are delisted, and are skipped for 30 days.
+        - Empty information or one without a name is also returned while throttled, so those are queued in
+          ``throttled`` to be retried.
+    """
+    try:
+        while (payload := payloads.get()) is not None:
+            stock, info = payload
+            try:
+                if stock_data := extract_data(data=info):
+                    stock_map[stock] = stock_data
+                elif info and not (info.get('quoteType') and info.get('symbol')):
+                    negative_cache[stock] = time() + DELISTED_TTL
+                else:
+                    throttled.put(stock)
+            except Exception as err:  # keeps the consumer alive, so that the fetch never blocks forever
+                file_logger.error(f'Failed to extract {stock}.\n{type(err).__name__}: {err}', extra={'ticker': stock})
+            finally:
+                payloads.task_done()
+    finally:
+        extraction_stopped.set()  # releases the workers waiting on a full queue
+
+
+def writer(mapping_dict: dict, sort_keys: list) -> int:
+    """Writes the global variable value ``{stock_map}`` to a spreadsheet with a worksheet for each view.
 
     Args:
         mapping_dict: Takes a dictionary as argument.
+        sort_keys: Index values of the columns chosen to sort the spreadsheet.
+
+    See Also:
+        - Rows are ordered by stock ticker, unless the worksheet is for a sort key.
+        - Each worksheet is written as soon as its view is prepared, and its rows are flushed in ``constant_memory``
+          mode, so only one view is held in memory at a time.
+        - Each worksheet has a frozen header, an autofilter, data bars on ``Dividend Yield`` and a color scale
+          on ``Rating``.
 
     Returns:
         int:
         Returns the number of elements in the dictionary.
     """
-    n = 0
-    for ticker in mapping_dict:
-        n = n + 1
-        worksheet.write(n, 0, ticker)
-        worksheet.write(n, 1, mapping_dict[ticker][0])
-        worksheet.write(n, 2, mapping_dict[ticker][1])
-        worksheet.write(n, 3, mapping_dict[ticker][2])
-        worksheet.write(n, 4, mapping_dict[ticker][3])
-        worksheet.write(n, 5, mapping_dict[ticker][4])
-        worksheet.write(n, 6, mapping_dict[ticker][5])
-        worksheet.write(n, 7, mapping_dict[ticker][6])
-        worksheet.write(n, 8, mapping_dict[ticker][7])
-        worksheet.write(n, 9, mapping_dict[ticker][8])
-        worksheet.write(n, 10, mapping_dict[ticker][9])
-        worksheet.write(n, 11, mapping_dict[ticker][10])
-        worksheet.write(n, 12, mapping_dict[ticker][11])
-        worksheet.write(n, 13, mapping_dict[ticker][12])
-        worksheet.write(n, 14, mapping_dict[ticker][13])
-        worksheet.write(n, 15, mapping_dict[ticker][14])
+    mapping_dict = dict(sorted(mapping_dict.items()))
+    header_format = workbook.add_format({'bold': True})
+    dividend, rating = headers.index('Dividend Yield'), headers.index('Rating')
+    for view in sheet_views(mapping_dict=mapping_dict, sort_keys=sort_keys):
+        name, rows = sheet_payload(mapping_dict=mapping_dict, view=view)
+        worksheet = workbook.add_worksheet(name)
+        worksheet.write_row(0, 0, headers, header_format)
+        n = 0
+        for n, row in enumerate(rows, start=1):
+            worksheet.write_row(n, 0, row)
+        worksheet.freeze_panes(1, 0)
+        worksheet.autofilter(0, 0, n, len(headers) - 1)
+        if n:
+            worksheet.conditional_format(1, dividend, n, dividend, {'type': 'data_bar'})
+            worksheet.conditional_format(1, rating, n, rating, {'type': '3_color_scale',
+                                                                'min_color': '#63BE7B',
+                                                                'max_color': '#F8696B'})
     workbook.close()
     return len(mapping_dict)
 
@@ -265,48 +447,123 @@ def time_converter(seconds: int) -> str:
         return f'{seconds} seconds'
 
 
-def get_sort_key() -> int:
+def get_sort_keys() -> list:
     """Displays a menu to the user, and prompts to choose how the user likes to sort the spreadsheet.
 
+    See Also:
+        - Each chosen value is written as a separate worksheet, along with the ``Results`` sorted by stock ticker.
+        - Interrupting the menu, or running without a terminal writes only the ``Results`` sorted by stock ticker,
+          so that the workbook is always closed.
+
     Returns:
-        int:
-        Returns the index value using which the sorting has to be done.
+        list:
+        Returns the index values using which the sorting has to be done, or an empty list.
     """
-    title = "Please pick a value using which you'd like to sort the spreadsheet (Hit Ctrl+C to sort by stock ticker): "
+    title = "Please pick the values using which you'd like to sort the spreadsheet " \
+            "(SPACE to mark, ENTER to continue, Hit Ctrl+C to sort by stock ticker): "
     try:
-        option, index = pick(headers[1:], title, indicator='=>', default_index=0)
-        return index
-    except (error, KeyboardInterrupt):
+        return [index for option, index in pick(headers[1:], title, indicator='=>', multiselect=True,
+                                                min_selection_count=0)]
+    except KeyboardInterrupt:
+        console_logger.info('Sorting the spreadsheet by stock ticker.')
+    except error as err:
         if not (run_env := Process(getpid()).parent().name()).endswith('sh'):
             root_logger.error(f"You're using {run_env} to run the script.")
             root_logger.error("Either use a terminal or enable 'Emulate terminal in output console' under "
                               f"Edit Configurations.. -> Execution in your {run_env}.")
-            root_logger.error("Using default index to sort the spreadsheet.")
         else:
-            root_logger.error(error)
-        exit(1)
+            root_logger.error(err)
+        root_logger.error('Sorting the spreadsheet by stock ticker.')
+    return []
 
 
-def thread_executor() -> None:
+def drain_throttled() -> list:
+    """Waits for the extractor to catch up, and collects the tickers that returned an empty payload.
+
+    Returns:
+        list:
+        List of stock tickers that have to be retried as throttled.
+    """
+    with payloads.all_tasks_done:
+        while payloads.unfinished_tasks and not extraction_stopped.is_set():
+            payloads.all_tasks_done.wait(timeout=1)
+    stocks = []
+    while not throttled.empty():
+        stocks.append(throttled.get())
+    return stocks
+
+
+def thread_executor(window: int = 50) -> None:
     """Executes ``ThreadPool`` on all stock tickers with a max workers limit of 10.
 
+    Args:
+        window: Maximum number of tickers that are submitted to the ThreadPool at any given time.
+
     Warnings:
         - ``max_workers`` for ThreadPool is set to 10.
         - Increasing the number of workers will decrease the run time but may elevate the chances of a ``503`` response.
+        - Transient and throttled failures are re-processed through a ``RetryQueue`` with the same number of workers.
+        - Tickers that returned an empty payload are moved to the ``RetryQueue`` as throttled, after each round.
         - Shuts down the ThreadPool during either of the following:
 
             - KeyboardInterrupt (manual interrupt)
-            - ConnectionRefusedError (raised by analyzer in case of a 503) exceptions.
+            - ConnectionRefusedError (raised by analyzer in case of an IP range denial) exceptions.
+
+    See Also:
+        - Tickers are submitted in a sliding window, so only ``window`` futures are alive at once.
+        - Fetched information flows through the bounded ``payloads`` queue to ``extractor()``.
+        - On shutdown, pending tickers are cancelled while the running ones finish and are drained by the extractor.
     """
     console_logger.info(f'Instantiating multi threading to analyze {overall} NASDAQ stocks')
+    consumer = Thread(target=extractor, name='extractor')
+    consumer.start()
+    retry_queue = RetryQueue()
+    progress = tqdm(total=overall, desc='Analyzing Stocks', unit='stock', leave=True)
+    executor = ThreadPoolExecutor(max_workers=10)  # multi threaded to 10 workers for throttled processing
+    tickers, pending = iter(stocks), {}
     try:
-        with ThreadPoolExecutor(max_workers=10) as executor:  # multi threaded to 10 workers for throttled processing
-            list(tqdm(executor.map(analyzer, stocks), total=overall, desc='Analyzing Stocks', unit='stock', leave=True))
+        while True:
+            for stock in islice(tickers, window - len(pending)):
+                pending[executor.submit(analyzer, stock)] = stock
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if (category := future.result()) in (TRANSIENT, THROTTLED):
+                    retry_queue.put(ticker=pending[future], category=category)
+                del pending[future]
+                progress.update()
+        progress.close()
+        attempts = {}  # number of empty payloads returned by each ticker, so that the retries remain bounded
+        while True:
+            for stock in drain_throttled():
+                retry_queue.put(ticker=stock, category=THROTTLED, attempt=attempts.get(stock, 0))
+                attempts[stock] = attempts.get(stock, 0) + 1
+            if not retry_queue:
+                break
+            console_logger.info(f'Retrying {len(retry_queue)} stocks that failed due to transient errors or throttling')
+            retry_queue.process(function=analyzer, max_workers=10)
+        if retry_queue.exhausted:
+            file_logger.error(f'Retries exhausted for {len(retry_queue.exhausted)} stocks: {retry_queue.exhausted}')
     except ConnectionRefusedError:
         root_logger.error('Connection has been refused.')
     except KeyboardInterrupt:
         root_logger.error('Manual interrupt was received.')
-    ThreadPoolExecutor().shutdown(wait=False, cancel_futures=True)
+    finally:
+        progress.close()
+        executor.shutdown(wait=True, cancel_futures=True)
+        while consumer.is_alive():  # stops the extractor once everything that was fetched has been extracted
+            try:
+                payloads.put(None, timeout=1)
+                break
+            except Full:
+                continue
+        consumer.join()
+    if printed:  # repeated 404s were an IP range denial, so they do not indicate delisted tickers
+        file_logger.error(f'Discarding {len(not_found)} 404 responses received before the IP range denial.')
+    else:
+        negative_cache.update(not_found)
+    dump_negative_cache(cache=negative_cache)
 
 
 def find_free_port() -> int:
@@ -343,11 +600,28 @@ def get_web_index() -> str:
     return host
 
 
-def host_as_webpage():
-    """Converts the generated spreadsheet as an HTML file and hosts it on localserver."""
-    console_logger.info(f'Converting {filename} to an HTML file.')
-    wb_to_html = read_excel(filename)
-    wb_to_html.to_html('index.html')
+def humanize(value: Union[int, float]) -> str:
+    """Formats the numeric values read from the snapshot the same way as they are in the spreadsheet.
+
+    Args:
+        value: Numeric value from the snapshot, where ``NaN`` and ``-1`` indicate a missing value.
+
+    Returns:
+        str:
+        Value converted by ``numerize`` or an empty string if the value is missing.
+    """
+    return numerize(value) if value == value and value >= 0 else ''
+
+
+def html_converter() -> None:
+    """Converts the generated snapshot as an HTML file."""
+    console_logger.info(f'Converting {snapshot} to an HTML file.')
+    wb_to_html = Snapshot(snapshot).to_frame(headers=headers)
+    wb_to_html.to_html('index.html', formatters={'Market Capital': humanize, 'Employees': humanize}, na_rep='')
+
+
+def host_as_webpage() -> None:
+    """Hosts the converted HTML file on localserver."""
     host, port = get_web_index(), find_free_port()
     console_logger.info(f'Hosting the analyzer results at: http://{host}:{port}')
     server = HTTPServer(server_address=(host, port), RequestHandlerClass=SimpleHTTPRequestHandler)
@@ -355,6 +629,15 @@ def host_as_webpage():
         server.serve_forever()
 
 
+def profile_report() -> None:
+    """Stops the profiler, logs the wall and CPU time of each stage and stores the profiles."""
+    files = profiler.stop(prefix=filename.replace('stocks_', 'profile_').replace('.xlsx', ''))
+    for row in profiler.summary():
+        if row['thread'] == '*':
+            console_logger.info(f"{row['stage']}: {row['calls']} calls, {row['wall']}s wall, {row['cpu']}s CPU")
+    console_logger.info(f'Profiles stored as {", ".join(files)}')
+
+
 def finalizer() -> None:
     """Logs all the closure information and opens the spreadsheet."""
     console_logger.info(f'Total Stocks instantiated: {overall}')
@@ -365,31 +648,74 @@ def finalizer() -> None:
     console_logger.info(f'Total execution time: {time_taken}')
     if analyzed:
         console_logger.info(f'Spreadsheet stored as {filename}')
+        console_logger.info(f'Snapshot stored as {snapshot}')
         system(f'open {filename}')  # opens spreadsheet post execution
+    html_converter()
+    if profiler:
+        profile_report()  # before hosting, since the server runs until it is interrupted
     host_as_webpage()
 
 
 if __name__ == '__main__':
+    parser = ArgumentParser(description='Analyze all NASDAQ stocks using Yahoo Finance API.')
+    parser.add_argument('--history', action='store_true',
+                        help='Fetch daily price history into data/history and add technical indicators as columns.')
+    parser.add_argument('--profile', nargs='?', const='sampling', choices=['sampling', 'cprofile'],
+                        help='Time each stage per thread and capture collapsed stacks for flamegraphs. '
+                             'Use cprofile to also store the cProfile stats.')
+    args = parser.parse_args()
+
     # import in _main_ so that data and logs dir are created in advance
     from lib.helper_functions import logging_wrapper, nasdaq
+    from lib.price_history import (INDICATORS, technical_indicators,
+                                   update_cache)
+    from lib.profiler import Profiler
+    from lib.retry_queue import (DELISTED_TTL, DROPPED, PERMANENT, THROTTLED,
+                                 TRANSIENT, RetryQueue, classify,
+                                 dump_negative_cache, load_negative_cache,
+                                 status_code)
+    from lib.snapshot import Snapshot, write_snapshot
 
     file_logger, console_logger, root_logger = logging_wrapper()
 
+    profiler = Profiler(mode=args.profile) if args.profile else None
+    if profiler:  # wraps the pipeline stages, which are looked up from the module globals when called
+        nasdaq, analyzer, fetch, enqueue, extract_data, sort_by_value, writer, html_converter = map(
+            profiler.stage, (nasdaq, analyzer, fetch, enqueue, extract_data, sort_by_value, writer, html_converter)
+        )
+        profiler.start()
+
     headers = columns()  # stores all the titles into a variable
     filename = datetime.now().strftime('data/stocks_%H:%M_%d-%m-%Y.xlsx')  # creates filename with date and time
-    workbook = Workbook(filename, {'strings_to_numbers': True})  # allows possible strings as numbers
-    worksheet = workbook.add_worksheet('Results')  # sheet name in the workbook
-    worksheet_initializer()  # initializes worksheet
-    stocks = nasdaq()  # gets all the NASDAQ stock ticket values starting A to Z
+    snapshot = filename.replace('.xlsx', '.snap')  # binary snapshot that can be memory mapped by readers
+    # allows possible strings as numbers and flushes each row to disk as soon as the next one is written
+    workbook = Workbook(filename, {'strings_to_numbers': True, 'constant_memory': True})
+    negative_cache = load_negative_cache()  # tickers that were 404 or delisted in previous runs
+    stocks = [stock for stock in nasdaq() if stock not in negative_cache]  # NASDAQ stock tickers starting A to Z
+    console_logger.info(f'Skipping {len(negative_cache)} stocks that were either delisted or not found earlier')
     overall = len(stocks)  # stores the number of stock tickers in a variable
 
     # other variables initialization
     stock_map = {}  # initiates stock_map as an empty dict
+    payloads = Queue(maxsize=50)  # bounded hand off between fetch and extract, applies backpressure on the fetch
+    throttled = SimpleQueue()  # tickers that returned an empty payload, which are retried by thread_executor
+    extraction_stopped = Event()  # set when the extractor exits, so that the fetch workers never wait forever
     count_404 = 0  # 404 responses recorded to see if it is repeated
+    not_found = {}  # 404 tickers, which are added to the negative cache only if the run was not denied
     printed = False  # initiates printed as False
     thread_executor()  # kicks off multi-threading
+    if args.history:
+        try:
+            console_logger.info(f'Appended {update_cache(tickers=list(stock_map))} price bars to the history cache')
+            indicators = technical_indicators(tickers=list(stock_map))
+        except Exception as err:  # the spreadsheet is still written, only without the indicator columns
+            root_logger.error(f'Failed to compute the technical indicators.\n{type(err).__name__}: {err}')
+        else:
+            headers += INDICATORS
+            for stock, values in indicators.items():
+                stock_map[stock] += values
+    write_snapshot(mapping_dict=stock_map, filename=snapshot, headers=headers)  # memory mapped copy for readers
 
-    if sort_val := get_sort_key():
-        stock_map = sort_by_value(data=stock_map, sort=sort_val)
-    analyzed = writer(mapping_dict=stock_map)  # gets the number of stocks analyzed after writing to workbook
+    # gets the number of stocks analyzed after writing all the views to workbook
+    analyzed = writer(mapping_dict=stock_map, sort_keys=get_sort_keys())
     finalizer()